@@ -14,15 +14,15 @@ os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
 # Now import other modules
 import logging
 from datetime import datetime
-from huggingface_hub import scan_cache_dir
+from utils.artifacts import PROJECT_DIR, apply_retention_policies, enforce_hf_cache_quota
 from utils.createAudio import generateAudio
-from utils.createFrames import generate_all_images
+from utils.createFrames import RELIABLE_MODELS, generate_all_images
 from utils.createScript import generateStory
 from utils.createVideo import create_video
 
 
 def configure_logging():
-    logs_dir = Path("logs")
+    logs_dir = PROJECT_DIR / "logs"
     logs_dir.mkdir(exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = logs_dir / f"storygen_{timestamp}.log"
@@ -48,17 +48,25 @@ def configure_logging():
 
 
 
+CATEGORY = "cartoon"
+
+
 # Updated main function
 if __name__ == "__main__":
     configure_logging()
     logger = logging.getLogger()  # Get configured logger
     
+    # Keep disk usage in check before generating anything
+    apply_retention_policies()
+    # Never evict the models this run may load
+    enforce_hf_cache_quota(keep=RELIABLE_MODELS[CATEGORY])
+    
     # Generate full script
     title, story = generateStory()
     
     # Create final video
     from utils.createVideo import create_video
-    video_path = create_video(story, category="cartoon")
+    video_path = create_video(story, category=CATEGORY)
     
     logger.info(f"Video created at: {video_path}")  # Use logger instead of logging
 
@@ -0,0 +1,180 @@
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from huggingface_hub import scan_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+GB = 1024 ** 3
+
+# Retention per artifact class: entries older than max_age_days are removed,
+# but the newest keep_last entries are always kept
+RETENTION_POLICIES = {
+    "story": {"max_age_days": 30, "keep_last": 20},
+    "videos": {"max_age_days": 14, "keep_last": 5},
+    "audio": {"max_age_days": 3, "keep_last": 0},
+    "frames": {"max_age_days": 3, "keep_last": 0},
+    "logs": {"max_age_days": 14, "keep_last": 10},
+}
+SCRATCH_MAX_AGE_DAYS = 1
+# Scratch sessions are named <YYYYmmdd_HHMMSS>_<random> by create_scratch_session
+SCRATCH_SESSION_PATTERN = re.compile(r"^\d{8}_\d{6}_\w+$")
+
+HF_CACHE_QUOTA_BYTES = int(float(os.getenv("HF_CACHE_QUOTA_GB", "20")) * GB)
+MIN_FREE_BYTES = int(float(os.getenv("MIN_FREE_DISK_GB", "2")) * GB)
+SCRATCH_MIN_FREE_BYTES = int(float(os.getenv("MIN_FREE_SCRATCH_GB", "0.5")) * GB)
+
+
+def get_scratch_root() -> Path:
+    """
+    Root for per-run intermediates: a storygen/ subdirectory of STORYGEN_SCRATCH_DIR if set,
+    otherwise of tmpfs (/dev/shm) when it has room, otherwise of the system temp dir.
+    """
+    configured = os.getenv("STORYGEN_SCRATCH_DIR")
+    if configured:
+        return Path(configured) / "storygen"
+    shm = Path("/dev/shm")
+    if (shm.is_dir() and os.access(shm, os.W_OK)
+            and shutil.disk_usage(shm).free >= SCRATCH_MIN_FREE_BYTES):
+        return shm / "storygen"
+    return Path(tempfile.gettempdir()) / "storygen"
+
+
+def create_scratch_session(timestamp: str) -> Path:
+    """Create a scratch dir unique to this run, even if another run starts in the same second."""
+    root = get_scratch_root()
+    root.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=f"{timestamp}_", dir=root))
+
+
+def remove_scratch_session(session_dir: Path):
+    shutil.rmtree(session_dir, ignore_errors=True)
+    logger.info(f"Removed scratch session: {session_dir}")
+
+
+def promote_artifact(src: Path, artifact_class: str, run_id: str,
+                     root: Path = PROJECT_DIR) -> Path:
+    """
+    Move a final output from scratch into persistent storage under <artifact_class>/<run_id>/.
+    run_id should be the scratch session name, which is unique per run.
+    The file is staged under a .part name and renamed, so a failed copy never leaves a truncated output.
+    """
+    dest_dir = root / artifact_class / run_id
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / src.name
+    staging = dest.with_name(dest.name + ".part")
+    try:
+        shutil.move(str(src), str(staging))
+        os.replace(staging, dest)
+    except Exception:
+        staging.unlink(missing_ok=True)
+        raise
+    logger.info(f"Promoted {artifact_class} artifact to: {dest}")
+    return dest
+
+
+def ensure_free_space(path: Path, min_bytes: int = MIN_FREE_BYTES):
+    """Raise before a render starts if the filesystem holding path is nearly full."""
+    path = Path(path)
+    while not path.exists():
+        path = path.parent
+    free = shutil.disk_usage(path).free
+    if free < min_bytes:
+        raise RuntimeError(
+            f"Only {free / GB:.2f} GB free at {path}, need at least {min_bytes / GB:.2f} GB"
+        )
+
+
+def apply_retention_policies(root: Path = PROJECT_DIR, now: Optional[float] = None) -> int:
+    """Prune artifact directories according to RETENTION_POLICIES and sweep stale scratch sessions."""
+    now = now or time.time()
+    removed = 0
+    for artifact_class, policy in RETENTION_POLICIES.items():
+        removed += _prune(root / artifact_class, policy["max_age_days"], policy["keep_last"], now)
+    removed += _prune(get_scratch_root(), SCRATCH_MAX_AGE_DAYS, 0, now,
+                      pattern=SCRATCH_SESSION_PATTERN)
+    if removed:
+        logger.info(f"Retention removed {removed} artifact(s)")
+    return removed
+
+
+def enforce_hf_cache_quota(quota_bytes: int = HF_CACHE_QUOTA_BYTES,
+                           keep: Iterable[str] = ()) -> int:
+    """
+    Evict least recently accessed repos from the HF cache until it fits in quota_bytes.
+    Repos listed in keep are never evicted. Returns the number of bytes freed.
+    """
+    cache_dir = os.getenv("HF_HUB_CACHE")
+    try:
+        cache_info = scan_cache_dir(cache_dir)
+    except Exception as e:
+        logger.warning(f"HF cache scan failed: {e}")
+        return 0
+
+    size = cache_info.size_on_disk
+    logger.info(f"HF cache size: {size / GB:.2f} GB (quota {quota_bytes / GB:.2f} GB)")
+    if size <= quota_bytes:
+        return 0
+
+    keep = set(keep)
+    candidates = sorted(
+        (repo for repo in cache_info.repos if repo.repo_id not in keep),
+        key=lambda repo: repo.last_accessed,
+    )
+    revisions, evicted = [], []
+    for repo in candidates:
+        if size <= quota_bytes:
+            break
+        revisions.extend(rev.commit_hash for rev in repo.revisions)
+        evicted.append(repo.repo_id)
+        size -= repo.size_on_disk
+
+    if not revisions:
+        logger.warning("HF cache over quota but nothing is evictable")
+        return 0
+
+    strategy = cache_info.delete_revisions(*revisions)
+    strategy.execute()
+    logger.info(f"Evicted from HF cache: {', '.join(evicted)} "
+                f"({strategy.expected_freed_size / GB:.2f} GB freed)")
+    return strategy.expected_freed_size
+
+
+def _prune(directory: Path, max_age_days: float, keep_last: int, now: float,
+           pattern: Optional[re.Pattern] = None) -> int:
+    if not directory.is_dir():
+        return 0
+    entries = []
+    for p in directory.iterdir():
+        if p.name.startswith(".") or (pattern and not pattern.match(p.name)):
+            continue
+        try:
+            entries.append((p.stat().st_mtime, p))
+        except FileNotFoundError:
+            # Removed by a concurrent run between iterdir() and stat()
+            continue
+    entries.sort(key=lambda e: e[0], reverse=True)
+
+    cutoff = now - max_age_days * 86400
+    removed = 0
+    for mtime, entry in entries[keep_last:]:
+        if mtime >= cutoff:
+            continue
+        try:
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"Could not remove {entry}: {e}")
+    return removed
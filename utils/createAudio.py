@@ -7,6 +7,8 @@ from elevenlabs.client import ElevenLabs
 import logging
 import random
 
+from utils.artifacts import PROJECT_DIR
+
 load_dotenv()
 audio_api_key = os.getenv("ELEVEN_LABS_API_KEY")
 
@@ -44,7 +46,7 @@ def generateAudio(script: str, output_path: str = None, gender: str = None) -> s
     # Prepare output path
     if not output_path:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = Path(f"audio/{timestamp}")
+        output_dir = PROJECT_DIR / "audio" / timestamp
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / "story.mp3"
     else:
@@ -12,6 +12,8 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from diffusers import StableDiffusionPipeline, StableDiffusionXLPipeline
 
+from utils.artifacts import PROJECT_DIR
+
 # Configuration
 MAX_FRAMES = 4
 MAX_SENTENCES_PER_CHUNK = 1
@@ -76,7 +78,7 @@ def split_story(story: str):
     return chunks
 
 
-def generate_all_images(story_text: str, imageType: str, output_dir: Path = Path("frames")):
+def generate_all_images(story_text: str, imageType: str, output_dir: Path = PROJECT_DIR / "frames"):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     session_dir = output_dir / timestamp
     session_dir.mkdir(parents=True, exist_ok=True)
@@ -10,6 +10,8 @@ import re
 
 import pandas as pd
 
+from utils.artifacts import PROJECT_DIR
+
 # Load environment variables
 load_dotenv()
 
@@ -55,7 +57,7 @@ def generateStory() -> str:
         logging.info(f"Generated story length: {len(story)} characters")
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        outputDir = Path(f"story/{timestamp}")
+        outputDir = PROJECT_DIR / "story" / timestamp
         outputDir.mkdir(parents=True, exist_ok=True)
 
         storyPath = outputDir / "story.txt"
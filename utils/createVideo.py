@@ -3,41 +3,79 @@ from pathlib import Path
 from datetime import datetime
 from typing import List
 import subprocess
-import moviepy.editor as mpe
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.artifacts import (
+    PROJECT_DIR,
+    SCRATCH_MIN_FREE_BYTES,
+    create_scratch_session,
+    ensure_free_space,
+    promote_artifact,
+    remove_scratch_session,
+)
 from utils.createFrames import MAX_WORKERS, split_story, ImageGenerator
+from utils.mediaProbe import check_shorts_budget, probe_duration
 
 logger = logging.getLogger(__name__)
 
 def create_video(script: str, category: str = "cartoon") -> Path:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Create session directories
-    video_dir = Path("videos") / timestamp
-    audio_dir = Path("audio") / timestamp
-    frames_dir = Path("frames") / timestamp
+    # Intermediates live in a scratch session; only the final video is promoted
+    scratch_dir = create_scratch_session(timestamp)
+    video_dir = scratch_dir / "videos"
+    audio_dir = scratch_dir / "audio"
+    frames_dir = scratch_dir / "frames"
     
     for dir in [video_dir, audio_dir, frames_dir]:
         dir.mkdir(parents=True, exist_ok=True)
     
-    chunks = split_story(script)
-    logger.info(f"Processing {len(chunks)} story chunks")
+    try:
+        chunks = split_story(script)
+        logger.info(f"Processing {len(chunks)} story chunks")
+
+        # Narration first, so over-length stories are rejected before any encoding
+        audio_paths = generate_audio_chunks(chunks, audio_dir)
+        check_shorts_budget(audio_paths)
 
-    chunk_paths = process_chunks_parallel(chunks, category, video_dir, audio_dir, frames_dir)
-    final_path = combine_video_chunks(chunk_paths, video_dir)
+        ensure_free_space(scratch_dir, SCRATCH_MIN_FREE_BYTES)
+        ensure_free_space(PROJECT_DIR / "videos")
+
+        chunk_paths = process_chunks_parallel(chunks, audio_paths, category, video_dir, frames_dir)
+        scratch_final = combine_video_chunks(chunk_paths, video_dir)
+        final_path = promote_artifact(scratch_final, "videos", scratch_dir.name)
+    finally:
+        remove_scratch_session(scratch_dir)
     
     logger.info(f"✅ Final video generated: {final_path}")
     return final_path
 
-def process_chunks_parallel(chunks: List[str], category: str, 
-                          video_dir: Path, audio_dir: Path, frames_dir: Path) -> List[Path]:
+def generate_audio_chunks(chunks: List[str], audio_dir: Path) -> List[Path]:
+    audio_paths = [audio_dir / f"chunk_{idx:03d}.mp3" for idx in range(len(chunks))]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(
+            generate_audio_chunk, chunk, audio_paths[idx]
+        ): idx for idx, chunk in enumerate(chunks)}
+
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Audio for chunk {idx} failed: {str(e)}")
+                raise
+
+    return audio_paths
+
+def process_chunks_parallel(chunks: List[str], audio_paths: List[Path], category: str,
+                          video_dir: Path, frames_dir: Path) -> List[Path]:
     chunk_paths = [None] * len(chunks)
     
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {executor.submit(
             process_single_chunk, 
-            chunk, idx, category, video_dir, audio_dir, frames_dir
+            chunk, idx, audio_paths[idx], category, video_dir, frames_dir
         ): idx for idx, chunk in enumerate(chunks)}
         
         for future in as_completed(futures):
@@ -50,18 +88,14 @@ def process_chunks_parallel(chunks: List[str], category: str,
     
     return [p for p in chunk_paths if p is not None]
 
-def process_single_chunk(chunk: str, idx: int, category: str, 
-                       video_dir: Path, audio_dir: Path, frames_dir: Path) -> Path:
+def process_single_chunk(chunk: str, idx: int, audio_path: Path, category: str,
+                       video_dir: Path, frames_dir: Path) -> Path:
     # Create per-chunk video directory
     chunk_video_dir = video_dir / f"chunk_{idx:03d}"
     chunk_video_dir.mkdir(exist_ok=True)
     
-    # Generate assets in their respective directories
-    audio_path = audio_dir / f"chunk_{idx:03d}.mp3"
+    # Generate image in its respective directory (audio is already generated)
     image_path = frames_dir / f"chunk_{idx:03d}.png"
-    
-    # Generate assets
-    generate_audio_chunk(chunk, audio_path)
     generate_image_chunk(chunk, category, image_path)
     
     # Create video clip
@@ -80,23 +114,24 @@ def generate_image_chunk(prompt: str, category: str, output_path: Path) -> Path:
     return output_path
 
 def create_video_clip(audio_path: Path, image_path: Path, output_path: Path) -> Path:
-    try:
-        audio = mpe.AudioFileClip(str(audio_path))
-        clip = mpe.ImageClip(str(image_path)).set_duration(audio.duration)
-        clip = clip.set_audio(audio)
-        
-        clip.write_videofile(
-            str(output_path),
-            fps=24,
-            codec="libx264",
-            audio_codec="aac",
-            threads=4,
-            logger=None
-        )
-        return output_path
-    finally:
-        if 'clip' in locals(): clip.close()
-        if 'audio' in locals(): audio.close()
+    # Duration comes from the mp3 headers; ffmpeg loops the still image and
+    # encodes the narration to AAC in one pass, with no MoviePy audio decode
+    subprocess.run([
+        "ffmpeg",
+        "-loop", "1",
+        "-framerate", "24",
+        "-i", str(image_path),
+        "-i", str(audio_path),
+        "-t", f"{probe_duration(audio_path):.3f}",
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-threads", "4",
+        "-loglevel", "error",
+        str(output_path),
+        "-y"
+    ], check=True)
+    return output_path
 
 def combine_video_chunks(chunk_paths: List[Path], session_dir: Path) -> Path:
     list_file = session_dir / "chunks.txt"
@@ -0,0 +1,211 @@
+import logging
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# YouTube Shorts hard limit (seconds)
+SHORTS_MAX_DURATION = 60.0
+
+# Bytes read after the ID3v2 tag when hunting for the first MPEG frame
+_MP3_SCAN_BYTES = 64 * 1024
+
+# MPEG audio bitrate tables (kbps), indexed by [version_class][layer][bitrate_index]
+_MP3_BITRATES = {
+    1: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    2: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+_MP3_SAMPLE_RATES = {
+    "1": [44100, 48000, 32000],
+    "2": [22050, 24000, 16000],
+    "2.5": [11025, 12000, 8000],
+}
+_MP3_VERSIONS = {0: "2.5", 2: "2", 3: "1"}
+_MP3_LAYERS = {1: 3, 2: 2, 3: 1}
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    path: str
+    format: str
+    duration: float
+    sample_rate: int
+    channels: int
+    bitrate: Optional[int] = None  # bits per second
+
+
+def probe_media(path: Union[str, Path]) -> MediaInfo:
+    """
+    Read duration and stream parameters from container/frame headers.
+    Results are memoized per (path, mtime, size), so a rewritten file is re-probed.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _probe_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def probe_duration(path: Union[str, Path]) -> float:
+    return probe_media(path).duration
+
+
+def check_shorts_budget(paths: Iterable[Union[str, Path]],
+                        max_duration: float = SHORTS_MAX_DURATION) -> float:
+    """Return the total duration of the given media files, raising if it exceeds the Shorts limit."""
+    total = sum(probe_duration(p) for p in paths)
+    if total > max_duration:
+        raise ValueError(f"Total duration {total:.2f}s exceeds Shorts limit of {max_duration:.0f}s")
+    logger.info(f"Total audio duration {total:.2f}s (limit {max_duration:.0f}s)")
+    return total
+
+
+def clear_probe_cache():
+    _probe_cached.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> MediaInfo:
+    with open(path, "rb") as f:
+        head = f.read(12)
+        f.seek(0)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _probe_wav(f, path)
+        return _probe_mp3(f, path, size)
+
+
+def _probe_wav(f, path: str) -> MediaInfo:
+    f.seek(12)
+    fmt = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), 1)
+        elif chunk_id == b"data":
+            if fmt is None:
+                break
+            _, channels, sample_rate, byte_rate, _, _ = fmt
+            if not byte_rate:
+                break
+            return MediaInfo(
+                path=path,
+                format="wav",
+                duration=chunk_size / byte_rate,
+                sample_rate=sample_rate,
+                channels=channels,
+                bitrate=byte_rate * 8,
+            )
+        else:
+            f.seek(chunk_size + (chunk_size & 1), 1)
+    raise ValueError(f"Unsupported or truncated WAV file: {path}")
+
+
+def _probe_mp3(f, path: str, size: int) -> MediaInfo:
+    start = 0
+    tag = f.read(10)
+    if len(tag) == 10 and tag[:3] == b"ID3":
+        # Syncsafe size excludes the 10-byte header; a footer adds another 10
+        tag_size = (tag[6] << 21) | (tag[7] << 14) | (tag[8] << 7) | tag[9]
+        start = 10 + tag_size + (10 if tag[5] & 0x10 else 0)
+
+    f.seek(start)
+    buf = f.read(_MP3_SCAN_BYTES)
+    offset, frame = _find_mp3_frame(buf)
+    if frame is None:
+        raise ValueError(f"No MPEG audio frame found in: {path}")
+
+    version, layer, bitrate, sample_rate, channels, samples_per_frame = frame
+    audio_start = start + offset
+
+    frames = _read_vbr_frame_count(buf, offset, version, channels)
+    if frames is not None:
+        duration = frames * samples_per_frame / sample_rate
+        audio_bytes = size - audio_start
+        bitrate = int(audio_bytes * 8 / duration) if duration else bitrate
+    else:
+        # CBR: duration follows from the audio payload size
+        audio_end = size
+        f.seek(max(size - 128, 0))
+        if f.read(3) == b"TAG":
+            audio_end -= 128
+        duration = (audio_end - audio_start) * 8 / bitrate
+
+    return MediaInfo(
+        path=path,
+        format="mp3",
+        duration=duration,
+        sample_rate=sample_rate,
+        channels=channels,
+        bitrate=bitrate,
+    )
+
+
+def _parse_mp3_header(header: bytes):
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = _MP3_VERSIONS.get((header[1] >> 3) & 0x03)
+    layer = _MP3_LAYERS.get((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = _MP3_BITRATES[1 if version == "1" else 2][layer][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    channels = 1 if (header[3] >> 6) == 3 else 2
+    padding = (header[2] >> 1) & 0x01
+
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or version == "1") else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+
+    return (version, layer, bitrate, sample_rate, channels, samples_per_frame), frame_length
+
+
+def _find_mp3_frame(buf: bytes):
+    offset = buf.find(b"\xff")
+    while 0 <= offset < len(buf) - 4:
+        parsed = _parse_mp3_header(buf[offset:offset + 4])
+        if parsed is not None:
+            frame, frame_length = parsed
+            next_offset = offset + frame_length
+            # Require the following frame to sync too, to reject false positives
+            if next_offset + 4 > len(buf) or _parse_mp3_header(buf[next_offset:next_offset + 4]):
+                return offset, frame
+        offset = buf.find(b"\xff", offset + 1)
+    return -1, None
+
+
+def _read_vbr_frame_count(buf: bytes, offset: int, version: str, channels: int) -> Optional[int]:
+    # Xing/Info header sits right after the side information
+    if version == "1":
+        side_info = 17 if channels == 1 else 32
+    else:
+        side_info = 9 if channels == 1 else 17
+    xing = offset + 4 + side_info
+    if buf[xing:xing + 4] in (b"Xing", b"Info") and len(buf) >= xing + 12:
+        flags = struct.unpack(">I", buf[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            return struct.unpack(">I", buf[xing + 8:xing + 12])[0] or None
+
+    # Fraunhofer VBRI header sits at a fixed offset of 32 bytes
+    vbri = offset + 4 + 32
+    if buf[vbri:vbri + 4] == b"VBRI" and len(buf) >= vbri + 18:
+        return struct.unpack(">I", buf[vbri + 14:vbri + 18])[0] or None
+    return None